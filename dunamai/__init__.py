@@ -18,9 +18,10 @@ import re
 import shlex
 import shutil
 import subprocess
+import sys
 from collections import OrderedDict
 from enum import Enum
-from functools import total_ordering
+from functools import lru_cache
 from pathlib import Path
 from typing import (
     Any,
@@ -35,7 +36,6 @@ from typing import (
     TypeVar,
     Union,
 )
-from xml.etree import ElementTree
 
 VERSION_SOURCE_PATTERN = r"""
     (?x)                                                        (?# ignore whitespace)
@@ -64,11 +64,109 @@ _VALID_SEMVER = r"""
 """.strip()
 _VALID_PVP = r"^\d+(\.\d+)*(-[a-zA-Z0-9]+)*$"
 
+_VALID_SEMVER_RE = re.compile(_VALID_SEMVER)
+
+
+def _is_ascii_alphanumeric(c: str) -> bool:
+    return "0" <= c <= "9" or "a" <= c <= "z" or "A" <= c <= "Z"
+
+
+def _check_version_pep440(version: str) -> bool:
+    """
+    Validate PEP 440 format (`_VALID_PEP440`) with a single linear scan,
+    avoiding regex backtracking on pathological input.
+    """
+    length = len(version)
+
+    def scan_digits(start: int) -> int:
+        end = start
+        while end < length and "0" <= version[end] <= "9":
+            end += 1
+        return end
+
+    # Optional epoch:
+    position = scan_digits(0)
+    if position > 0 and position < length and version[position] == "!":
+        position += 1
+    else:
+        position = 0
+
+    # Release segments:
+    end = scan_digits(position)
+    if end == position:
+        return False
+    position = end
+    while position < length and version[position] == ".":
+        end = scan_digits(position + 1)
+        if end == position + 1:
+            # Not more release digits; could be a post/dev segment.
+            break
+        position = end
+
+    # Optional pre-release segment:
+    for stage in ("a", "b", "rc"):
+        if version.startswith(stage, position):
+            end = scan_digits(position + len(stage))
+            if end > position + len(stage):
+                position = end
+            break
+
+    # Optional post and dev segments:
+    for segment in (".post", ".dev"):
+        if version.startswith(segment, position):
+            end = scan_digits(position + len(segment))
+            if end > position + len(segment):
+                position = end
+
+    # Optional local metadata:
+    if position < length and version[position] == "+":
+        local = version[position + 1 :]
+        if not local:
+            return False
+        if not _is_ascii_alphanumeric(local[0]) or not _is_ascii_alphanumeric(local[-1]):
+            return False
+        if any(not _is_ascii_alphanumeric(c) and c != "." for c in local):
+            return False
+        position = length
+
+    return position == length
+
+
+def _check_version_pvp(version: str) -> bool:
+    """
+    Validate PVP format (`_VALID_PVP`) with plain string operations:
+    dot-separated numbers, then optional dash-separated alphanumeric tags.
+    """
+    head, sep, tail = version.partition("-")
+    for part in head.split("."):
+        if not part or not all("0" <= c <= "9" for c in part):
+            return False
+    if sep:
+        for tag in tail.split("-"):
+            if not tag or not all(_is_ascii_alphanumeric(c) for c in tag):
+                return False
+    return True
+
+
 _TIMESTAMP_GENERIC = "%Y-%m-%dT%H:%M:%S.%f%z"
 _TIMESTAMP_GENERIC_SPACE = "%Y-%m-%d %H:%M:%S.%f%z"
 _TIMESTAMP_GIT_ISO_STRICT = "%Y-%m-%dT%H:%M:%S%z"
 _TIMESTAMP_GIT_ISO = "%Y-%m-%d %H:%M:%S %z"
 
+_TIMESTAMP_TZ_COLON_STRICT_RE = re.compile(r"(.*T.*[-+]\d+):(\d+)")
+_TIMESTAMP_TZ_COLON_RE = re.compile(r"(.* .* [-+]\d+):(\d+)")
+_TIMESTAMP_ZULU_RE = re.compile(r"Z$")
+_TIMESTAMP_SUBSECOND_RE = re.compile(r"\.(\d{6})\d+\+0000")
+
+_BRANCH_ESCAPE_RE = re.compile(r"[^a-zA-Z0-9]")
+# Decorations are joined by ", " and the list ends with ")" at the end of the line.
+# Bare commas and parentheses can legitimately appear inside a tag name,
+# but spaces cannot, so ", " and a line-final ")" are unambiguous delimiters.
+_TAG_DECORATION_RE = re.compile(r"tag: (\S+?)(?=, |\)$)")
+_PARSE_POST_DEV_RE = re.compile(r"(\.post(\d+)\.dev\d+)")
+_PARSE_DISTANCE_RE = re.compile(r"d?(\d+)")
+_PARSE_COMMIT_RE = re.compile(r"g?([\da-z]+)")
+
 _T = TypeVar("_T")
 
 
@@ -200,15 +298,20 @@ def _pattern_error(primary: str, pattern: Union[str, Pattern], tags: Optional[Se
     return "\n\n".join(parts)
 
 
+@lru_cache(maxsize=64)
+def _compile_pattern(pattern: str) -> "re.Pattern":
+    return re.compile(pattern)
+
+
 def _run_cmd(
-    command: str,
+    command: Union[str, Sequence[str]],
     where: Optional[Path],
     codes: Sequence[int] = (0,),
     shell: bool = False,
     env: Optional[dict] = None,
 ) -> Tuple[int, str]:
     result = subprocess.run(
-        shlex.split(command),
+        shlex.split(command) if isinstance(command, str) else list(command),
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
         cwd=str(where) if where is not None else None,
@@ -217,7 +320,8 @@ def _run_cmd(
     )
     output = result.stdout.decode().strip()
     if codes and result.returncode not in codes:
-        raise RuntimeError("The command '{}' returned code {}. Output:\n{}".format(command, result.returncode, output))
+        rendered = command if isinstance(command, str) else " ".join(command)
+        raise RuntimeError("The command '{}' returned code {}. Output:\n{}".format(rendered, result.returncode, output))
     return (result.returncode, output)
 
 
@@ -260,27 +364,29 @@ def _match_version_pattern(
 
     pattern = Pattern.parse(pattern, pattern_prefix)
 
-    for source in sources[:1] if latest_source else sources:
-        try:
-            pattern_match = re.search(pattern, source)
-        except re.error as e:
-            raise re.error(
-                _pattern_error(
-                    "The pattern is an invalid regular expression: {}".format(e.msg),  # type: ignore
-                    pattern,
-                ),
-                e.pattern,  # type: ignore
-                e.pos,  # type: ignore
-            )
+    try:
+        compiled = _compile_pattern(pattern)
+    except re.error as e:
+        raise re.error(
+            _pattern_error(
+                "The pattern is an invalid regular expression: {}".format(e.msg),  # type: ignore
+                pattern,
+            ),
+            e.pattern,  # type: ignore
+            e.pos,  # type: ignore
+        )
+
+    if "base" not in compiled.groupindex:
+        raise ValueError(_pattern_error("The pattern did not include required capture group 'base'", pattern))
+
+    for source in (sources[0],) if latest_source else sources:
+        pattern_match = compiled.search(source)
         if pattern_match is None:
             newer_unmatched_tags.append(source)
             continue
-        try:
-            base = pattern_match.group("base")
-            if base is not None:
-                break
-        except IndexError:
-            raise ValueError(_pattern_error("The pattern did not include required capture group 'base'", pattern))
+        base = pattern_match.group("base")
+        if base is not None:
+            break
     if pattern_match is None or base is None:
         if latest_source:
             raise ValueError(
@@ -295,10 +401,11 @@ def _match_version_pattern(
         else:
             return None
 
-    stage = pattern_match.groupdict().get("stage")
-    revision = pattern_match.groupdict().get("revision")
-    tagged_metadata = pattern_match.groupdict().get("tagged_metadata")
-    epoch = pattern_match.groupdict().get("epoch")
+    named_groups = compiled.groupindex
+    stage = pattern_match.group("stage") if "stage" in named_groups else None
+    revision = pattern_match.group("revision") if "revision" in named_groups else None
+    tagged_metadata = pattern_match.group("tagged_metadata") if "tagged_metadata" in named_groups else None
+    epoch = pattern_match.group("epoch") if "epoch" in named_groups else None
     if stage is not None:
         try:
             stage_revision = (stage, None if revision is None else int(revision))
@@ -317,8 +424,15 @@ def _blank(value: Optional[_T], default: _T) -> _T:
     return value if value is not None else default
 
 
+@lru_cache(maxsize=1024)
+def _parse_base(base: str) -> Any:
+    import packaging.version as pv
+
+    return pv.Version(base)
+
+
 def _escape_branch(value: str) -> str:
-    return re.sub(r"[^a-zA-Z0-9]", "", value)
+    return _BRANCH_ESCAPE_RE.sub("", value)
 
 
 def _equal_if_set(x: _T, y: Optional[_T], unset: Sequence[Any] = (None,)) -> bool:
@@ -327,8 +441,9 @@ def _equal_if_set(x: _T, y: Optional[_T], unset: Sequence[Any] = (None,)) -> boo
     return x == y
 
 
+@lru_cache(maxsize=None)
 def _get_git_version() -> List[int]:
-    _, msg = _run_cmd("git version", where=None)
+    _, msg = _run_cmd(["git", "version"], where=None)
     result = re.search(r"git version (\d+(\.\d+)*)", msg.strip())
     if result is not None:
         parts = result.group(1).split(".")
@@ -336,23 +451,41 @@ def _get_git_version() -> List[int]:
     return []
 
 
-def _git_log(git_version: List[int]) -> str:
+def _git_log(git_version: List[int]) -> List[str]:
     if git_version < [2, 10]:
-        return "git log"
+        return ["git", "log"]
     else:
-        return "git -c log.showsignature=false log"
+        return ["git", "-c", "log.showsignature=false", "log"]
+
+
+@lru_cache(maxsize=None)
+def _find_program(program: str) -> Optional[str]:
+    return shutil.which(program)
+
+
+_VCS_MARKERS = OrderedDict(
+    [
+        (Vcs.Git, ".git"),
+        (Vcs.Mercurial, ".hg"),
+        (Vcs.Darcs, "_darcs"),
+        (Vcs.Subversion, ".svn"),
+        (Vcs.Bazaar, ".bzr"),
+        (Vcs.Fossil, ".fslckout"),
+        (Vcs.Pijul, ".pijul"),
+    ]
+)
 
 
 def _detect_vcs(expected_vcs: Optional[Vcs], path: Optional[Path]) -> Vcs:
     checks = OrderedDict(
         [
-            (Vcs.Git, "git status"),
-            (Vcs.Mercurial, "hg status"),
-            (Vcs.Darcs, "darcs log"),
-            (Vcs.Subversion, "svn log"),
-            (Vcs.Bazaar, "bzr status"),
-            (Vcs.Fossil, "fossil status"),
-            (Vcs.Pijul, "pijul log"),
+            (Vcs.Git, ("git", ["git", "status"])),
+            (Vcs.Mercurial, ("hg", ["hg", "status"])),
+            (Vcs.Darcs, ("darcs", ["darcs", "log"])),
+            (Vcs.Subversion, ("svn", ["svn", "log"])),
+            (Vcs.Bazaar, ("bzr", ["bzr", "status"])),
+            (Vcs.Fossil, ("fossil", ["fossil", "status"])),
+            (Vcs.Pijul, ("pijul", ["pijul", "log"])),
         ]
     )
 
@@ -360,9 +493,8 @@ def _detect_vcs(expected_vcs: Optional[Vcs], path: Optional[Path]) -> Vcs:
     dubious_ownership_error = "Detected Git repository, but failed because of dubious ownership"
 
     if expected_vcs:
-        command = checks[expected_vcs]
-        program = command.split()[0]
-        if not shutil.which(program):
+        program, command = checks[expected_vcs]
+        if not _find_program(program):
             raise RuntimeError("Unable to find '{}' program".format(program))
         code, msg = _run_cmd(command, path, codes=[])
         if code != 0:
@@ -371,10 +503,32 @@ def _detect_vcs(expected_vcs: Optional[Vcs], path: Optional[Path]) -> Vcs:
             raise RuntimeError("This does not appear to be a {} project".format(expected_vcs.value.title()))
         return expected_vcs
     else:
+        # Fast path: a telltale directory or file usually identifies the VCS
+        # without having to probe all of them with subprocesses.
+        start = path if path is not None else Path.cwd()
+        detected = None
+        for level in [start, *start.parents]:
+            for vcs, marker in _VCS_MARKERS.items():
+                if (level / marker).exists():
+                    detected = vcs
+                    break
+            if detected is not None:
+                break
+        if detected is not None:
+            program, command = checks[detected]
+            if _find_program(program):
+                code, msg = _run_cmd(command, path, codes=[])
+                if code == 0:
+                    return detected
+                if detected == Vcs.Git and dubious_ownership_flag in msg:
+                    raise RuntimeError(dubious_ownership_error)
+            # The marker was misleading or the tool is unavailable,
+            # so fall back to probing every VCS.
+
         disproven = []
         unavailable = []
-        for vcs, command in checks.items():
-            if shutil.which(command.split()[0]):
+        for vcs, (program, command) in checks.items():
+            if _find_program(program):
                 code, msg = _run_cmd(command, path, codes=[])
                 if code == 0:
                     return vcs
@@ -482,11 +636,15 @@ class _GitRefInfo:
 
     @staticmethod
     def from_git_tag_topo_order(tag_branch: str, git_version: List[int], path: Optional[Path]) -> Mapping[str, int]:
-        cmd = ('{} --simplify-by-decoration --topo-order --decorate=full {} "--format=%H%d"').format(
-            _git_log(git_version), tag_branch
-        )
+        cmd = _git_log(git_version) + [
+            "--simplify-by-decoration",
+            "--topo-order",
+            "--decorate=full",
+            tag_branch,
+            "--format=%H%d",
+        ]
         if git_version >= [2, 16]:
-            cmd += " --decorate-refs=refs/tags/"
+            cmd.append("--decorate-refs=refs/tags/")
         code, logmsg = _run_cmd(cmd, path)
 
         filtered_lines = [x for x in logmsg.strip().splitlines(keepends=False) if " (" not in x or "tag: " in x]
@@ -495,20 +653,11 @@ class _GitRefInfo:
         for tag_offset, line in enumerate(filtered_lines):
             # lines have the pattern
             # <gitsha1>  (tag: refs/tags/v1.2.0b1, tag: refs/tags/v1.2.0)
-            commit, _, tags = line.partition("(")
-            commit = commit.strip()
-            if tags:
-                # remove trailing ')'
-                tags = tags[:-1]
-                taglist = [tag.strip() for tag in tags.split(", ") if tag.strip().startswith("tag: ")]
-                taglist = [tag.split()[-1] for tag in taglist]
-                taglist = [_GitRefInfo.normalize_tag_ref(tag) for tag in taglist]
-                for tag in taglist:
-                    tag_lookup[tag] = tag_offset
+            for match in _TAG_DECORATION_RE.finditer(line):
+                tag_lookup[_GitRefInfo.normalize_tag_ref(match.group(1))] = tag_offset
         return tag_lookup
 
 
-@total_ordering
 class Version:
     """
     A dynamic version.
@@ -539,6 +688,24 @@ class Version:
     :vartype vcs: Vcs
     """
 
+    __slots__ = (
+        "base",
+        "stage",
+        "revision",
+        "distance",
+        "commit",
+        "dirty",
+        "tagged_metadata",
+        "epoch",
+        "branch",
+        "timestamp",
+        "concerns",
+        "vcs",
+        "_matched_tag",
+        "_newer_unmatched_tags",
+        "_smart_bumped",
+    )
+
     def __init__(
         self,
         base: str,
@@ -627,6 +794,22 @@ class Version:
             and self.timestamp == other.timestamp
         )
 
+    def __hash__(self) -> int:
+        return hash(
+            (
+                self.base,
+                self.stage,
+                self.revision,
+                self.distance,
+                self.commit,
+                self.dirty,
+                self.tagged_metadata,
+                self.epoch,
+                self.branch,
+                self.timestamp,
+            )
+        )
+
     def _matches_partial(self, other: "Version") -> bool:
         """
         Compare this version to another version, but ignore None values in the other version.
@@ -652,22 +835,40 @@ class Version:
         if not isinstance(other, Version):
             raise TypeError("Cannot compare Version with type {}".format(other.__class__.__qualname__))
 
-        import packaging.version as pv
-
+        blank_timestamp = dt.datetime.min.replace(tzinfo=dt.timezone.utc)
         return (
-            pv.Version(self.base) < pv.Version(other.base)
-            and _blank(self.stage, "") < _blank(other.stage, "")
-            and _blank(self.revision, 0) < _blank(other.revision, 0)
-            and _blank(self.distance, 0) < _blank(other.distance, 0)
-            and _blank(self.commit, "") < _blank(other.commit, "")
-            and bool(self.dirty) < bool(other.dirty)
-            and _blank(self.tagged_metadata, "") < _blank(other.tagged_metadata, "")
-            and _blank(self.epoch, 0) < _blank(other.epoch, 0)
-            and _blank(self.branch, "") < _blank(other.branch, "")
-            and _blank(self.timestamp, dt.datetime(0, 0, 0, 0, 0, 0))
-            < _blank(other.timestamp, dt.datetime(0, 0, 0, 0, 0, 0))
+            _parse_base(self.base),
+            _blank(self.stage, ""),
+            _blank(self.revision, 0),
+            _blank(self.distance, 0),
+            _blank(self.commit, ""),
+            bool(self.dirty),
+            _blank(self.tagged_metadata, ""),
+            _blank(self.epoch, 0),
+            _blank(self.branch, ""),
+            _blank(self.timestamp, blank_timestamp),
+        ) < (
+            _parse_base(other.base),
+            _blank(other.stage, ""),
+            _blank(other.revision, 0),
+            _blank(other.distance, 0),
+            _blank(other.commit, ""),
+            bool(other.dirty),
+            _blank(other.tagged_metadata, ""),
+            _blank(other.epoch, 0),
+            _blank(other.branch, ""),
+            _blank(other.timestamp, blank_timestamp),
         )
 
+    def __le__(self, other: Any) -> bool:
+        return self < other or self == other
+
+    def __gt__(self, other: Any) -> bool:
+        return not (self < other or self == other)
+
+    def __ge__(self, other: Any) -> bool:
+        return not (self < other)
+
     def serialize(
         self,
         metadata: Optional[bool] = None,
@@ -774,13 +975,15 @@ class Version:
                 meta_parts.append("dirty")
 
         pre_parts = []
-        if self.stage is not None:
-            pre_parts.append(self.stage)
-            if revision is not None:
-                pre_parts.append(str(revision))
-        if self.distance > 0:
-            pre_parts.append("pre" if bump or self._smart_bumped else "post")
-            pre_parts.append(str(self.distance))
+        if style != Style.Pep440:
+            # Only the SemVer and PVP styles consume these.
+            if self.stage is not None:
+                pre_parts.append(self.stage)
+                if revision is not None:
+                    pre_parts.append(str(revision))
+            if self.distance > 0:
+                pre_parts.append("pre" if bump or self._smart_bumped else "post")
+                pre_parts.append(str(self.distance))
 
         if style == Style.Pep440:
             stage = self.stage
@@ -821,7 +1024,8 @@ class Version:
         elif style == Style.Pvp:
             out = serialize_pvp(base, metadata=[*pre_parts, *meta_parts])
 
-        check_version(out, style)
+        # The serialize_* helpers have already validated their output,
+        # so no further check_version call is needed here.
         return out
 
     @classmethod
@@ -848,7 +1052,7 @@ class Version:
             failed = True
 
         if failed or matched_pattern is None:
-            replaced = re.sub(r"(\.post(\d+)\.dev\d+)", r".dev\2", version, 1)
+            replaced = _PARSE_POST_DEV_RE.sub(r".dev\2", version, 1)
             if replaced != version:
                 alt = Version.parse(replaced, pattern)
                 if alt.base != replaced:
@@ -879,13 +1083,13 @@ class Version:
                         pop.append(i)
                         continue
                 if distance is None:
-                    match = re.match(r"d?(\d+)", value)
+                    match = _PARSE_DISTANCE_RE.match(value)
                     if match:
                         distance = int(match.group(1))
                         pop.append(i)
                         continue
                 if commit is None:
-                    match = re.match(r"g?([\da-z]+)", value)
+                    match = _PARSE_COMMIT_RE.match(value)
                     if match:
                         commit = match.group(1)
                         pop.append(i)
@@ -1113,49 +1317,65 @@ class Version:
             if flag_file:
                 concerns.add(Concern.ShallowRepository)
         else:
-            code, msg = _run_cmd("git rev-parse --is-shallow-repository", path)
+            code, msg = _run_cmd(["git", "rev-parse", "--is-shallow-repository"], path)
             if msg.strip() == "true":
                 concerns.add(Concern.ShallowRepository)
 
         if strict and concerns:
             raise RuntimeError("\n".join(x.message() for x in concerns))
 
-        code, msg = _run_cmd("git symbolic-ref --short HEAD", path, codes=[0, 128])
+        code, msg = _run_cmd(["git", "symbolic-ref", "--short", "HEAD"], path, codes=[0, 128])
         if code == 128:
             branch = None
         else:
             branch = msg
 
+        old_timestamps = git_version < [2, 2]
         code, msg = _run_cmd(
-            '{} -n 1 --format="format:{}"'.format(_git_log(git_version), "%H" if full_commit else "%h"),
+            _git_log(git_version)
+            + [
+                "-n",
+                "1",
+                "--format=format:{}@{{{}".format(
+                    "%H" if full_commit else "%h",
+                    "%ci" if old_timestamps else "%cI",
+                ),
+            ],
             path,
             codes=[0, 128],
         )
         if code == 128:
             return cls._fallback(strict, distance=0, dirty=True, branch=branch, concerns=concerns, vcs=vcs)
-        commit = msg[:commit_length]
+        commit, _, raw_timestamp = msg.partition("@{")
+        commit = commit[:commit_length]
 
-        timestamp = None
-        if git_version < [2, 2]:
-            code, msg = _run_cmd('{} -n 1 --pretty=format:"%ci"'.format(_git_log(git_version)), path)
-            timestamp = _parse_git_timestamp_iso(msg)
+        if old_timestamps:
+            timestamp = _parse_git_timestamp_iso(raw_timestamp)
         else:
-            code, msg = _run_cmd('{} -n 1 --pretty=format:"%cI"'.format(_git_log(git_version)), path)
-            timestamp = _parse_git_timestamp_iso_strict(msg)
-
-        code, msg = _run_cmd("git describe --always --dirty", path)
-        dirty = msg.endswith("-dirty")
+            timestamp = _parse_git_timestamp_iso_strict(raw_timestamp)
 
-        if not dirty and not ignore_untracked:
-            code, msg = _run_cmd("git status --porcelain", path)
-            if msg.strip() != "":
-                dirty = True
+        code, msg = _run_cmd(["git", "status", "--porcelain"], path)
+        if ignore_untracked:
+            dirty = any(not line.startswith("??") for line in msg.splitlines())
+        else:
+            dirty = msg.strip() != ""
 
         if git_version < [2, 7]:
-            code, msg = _run_cmd('git for-each-ref "refs/tags/**" --format "%(refname)" --sort -creatordate', path)
+            code, msg = _run_cmd(
+                [
+                    "git",
+                    "for-each-ref",
+                    "refs/tags/**",
+                    "--format",
+                    "%(refname)",
+                    "--sort",
+                    "-creatordate",
+                ],
+                path,
+            )
             if not msg:
                 try:
-                    code, msg = _run_cmd("git rev-list --count HEAD", path)
+                    code, msg = _run_cmd(["git", "rev-list", "--count", "HEAD"], path)
                     distance = int(msg)
                 except Exception:
                     distance = 0
@@ -1173,17 +1393,24 @@ class Version:
             matched_pattern = _match_version_pattern(pattern, tags, latest_tag, strict, pattern_prefix)
         else:
             code, msg = _run_cmd(
-                'git for-each-ref "refs/tags/**" --merged {}'.format(tag_branch) + ' --format "%(refname)'
-                "@{%(objectname)"
-                "@{%(creatordate:iso-strict)"
-                "@{%(*committerdate:iso-strict)"
-                "@{%(taggerdate:iso-strict)"
-                '"',
+                [
+                    "git",
+                    "for-each-ref",
+                    "refs/tags/**",
+                    "--merged",
+                    tag_branch,
+                    "--format",
+                    "%(refname)"
+                    "@{%(objectname)"
+                    "@{%(creatordate:iso-strict)"
+                    "@{%(*committerdate:iso-strict)"
+                    "@{%(taggerdate:iso-strict)",
+                ],
                 path,
             )
             if not msg:
                 try:
-                    code, msg = _run_cmd("git rev-list --count HEAD", path)
+                    code, msg = _run_cmd(["git", "rev-list", "--count", "HEAD"], path)
                     distance = int(msg)
                 except Exception:
                     distance = 0
@@ -1207,12 +1434,16 @@ class Version:
                     continue
                 detailed_tags.append(_GitRefInfo(*parts).with_tag_topo_lookup(tag_topo_lookup))
 
-            tags = [t.ref for t in sorted(detailed_tags, key=lambda x: x.sort_key, reverse=True)]
+            if latest_tag and detailed_tags:
+                # Only the newest tag can match, so skip the full sort.
+                tags = [max(detailed_tags, key=lambda x: x.sort_key).ref]
+            else:
+                tags = [t.ref for t in sorted(detailed_tags, key=lambda x: x.sort_key, reverse=True)]
             matched_pattern = _match_version_pattern(pattern, tags, latest_tag, strict, pattern_prefix)
 
         if matched_pattern is None:
             try:
-                code, msg = _run_cmd("git rev-list --count HEAD", path)
+                code, msg = _run_cmd(["git", "rev-list", "--count", "HEAD"], path)
                 distance = int(msg)
             except Exception:
                 distance = 0
@@ -1229,7 +1460,7 @@ class Version:
             )
         tag, base, stage, unmatched, tagged_metadata, epoch = matched_pattern
 
-        code, msg = _run_cmd("git rev-list --count refs/tags/{}..HEAD".format(tag), path)
+        code, msg = _run_cmd(["git", "rev-list", "--count", "refs/tags/{}..HEAD".format(tag)], path)
         distance = int(msg)
 
         version = cls(
@@ -1340,27 +1571,34 @@ class Version:
 
         _detect_vcs(vcs, path)
 
-        code, msg = _run_cmd("hg summary", path)
-        dirty = "commit: (clean)" not in msg.splitlines()
+        code, msg = _run_cmd(["hg", "summary"], path)
+        # Anchor to full-line boundaries so that, e.g., a commit summary shown
+        # on the parent line cannot masquerade as the clean marker.
+        dirty = "\ncommit: (clean)\n" not in "\n{}\n".format(msg)
 
-        code, msg = _run_cmd("hg branch", path)
+        code, msg = _run_cmd(["hg", "branch"], path)
         branch = msg
 
-        code, msg = _run_cmd('hg id --template "{}"'.format("{id}" if full_commit else "{id|short}"), path)
-        commit = msg[:commit_length] if set(msg) != {"0"} else None
+        code, msg = _run_cmd(["hg", "id", "--template", "{id}" if full_commit else "{id|short}"], path)
+        commit = msg[:commit_length] if msg.strip("0") else None
 
-        code, msg = _run_cmd('hg log --limit 1 --template "{date|rfc3339date}"', path)
+        code, msg = _run_cmd(["hg", "log", "--limit", "1", "--template", "{date|rfc3339date}"], path)
         timestamp = _parse_git_timestamp_iso_strict(msg) if msg != "" else None
 
         code, msg = _run_cmd(
-            'hg log -r "sort(tag(){}, -rev)" --template "{{join(tags, \':\')}}\\n"'.format(
-                " and ancestors({})".format(commit) if commit is not None else ""
-            ),
+            [
+                "hg",
+                "log",
+                "-r",
+                "sort(tag(){}, -rev)".format(" and ancestors({})".format(commit) if commit is not None else ""),
+                "--template",
+                "{join(tags, ':')}\\n",
+            ],
             path,
         )
         if not msg:
             try:
-                code, msg = _run_cmd("hg id --num --rev tip", path)
+                code, msg = _run_cmd(["hg", "id", "--num", "--rev", "tip"], path)
                 distance = int(msg) + 1
             except Exception:
                 distance = 0
@@ -1373,7 +1611,9 @@ class Version:
                 timestamp=timestamp,
                 vcs=vcs,
             )
-        tags = [tag for tags in [line.split(":") for line in msg.splitlines()] for tag in tags]
+        tags = []  # type: List[str]
+        for line in msg.splitlines():
+            tags.extend(line.split(":"))
 
         matched_pattern = _match_version_pattern(pattern, tags, latest_tag, strict, pattern_prefix)
         if matched_pattern is None:
@@ -1388,7 +1628,7 @@ class Version:
             )
         tag, base, stage, unmatched, tagged_metadata, epoch = matched_pattern
 
-        code, msg = _run_cmd('hg log -r "{0}::{1} - {0}" --template "."'.format(tag, commit), path)
+        code, msg = _run_cmd(["hg", "log", "-r", "{0}::{1} - {0}".format(tag, commit), "--template", "."], path)
         # The tag itself is in the list, so offset by 1.
         distance = max(len(msg) - 1, 0)
 
@@ -1434,13 +1674,15 @@ class Version:
             Use this many characters from the start of the full commit hash.
         :returns: Detected version.
         """
+        from xml.etree import ElementTree
+
         vcs = Vcs.Darcs
         _detect_vcs(vcs, path)
 
-        code, msg = _run_cmd("darcs status", path, codes=[0, 1])
+        code, msg = _run_cmd(["darcs", "status"], path, codes=[0, 1])
         dirty = msg != "No changes!"
 
-        code, msg = _run_cmd("darcs log --last 1 --xml-output", path)
+        code, msg = _run_cmd(["darcs", "log", "--last", "1", "--xml-output"], path)
         root = ElementTree.fromstring(msg)
         if len(root) == 0:
             commit = None
@@ -1451,10 +1693,10 @@ class Version:
                 commit = commit[:commit_length]
             timestamp = dt.datetime.strptime(root[0].attrib["date"] + "+0000", "%Y%m%d%H%M%S%z")
 
-        code, msg = _run_cmd("darcs show tags", path)
+        code, msg = _run_cmd(["darcs", "show", "tags"], path)
         if not msg:
             try:
-                code, msg = _run_cmd("darcs log --count", path)
+                code, msg = _run_cmd(["darcs", "log", "--count"], path)
                 distance = int(msg)
             except Exception:
                 distance = 0
@@ -1473,7 +1715,7 @@ class Version:
             )
         tag, base, stage, unmatched, tagged_metadata, epoch = matched_pattern
 
-        code, msg = _run_cmd("darcs log --from-tag {} --count".format(tag), path)
+        code, msg = _run_cmd(["darcs", "log", "--from-tag", tag, "--count"], path)
         # The tag itself is in the list, so offset by 1.
         distance = int(msg) - 1
 
@@ -1525,13 +1767,13 @@ class Version:
 
         tag_dir = tag_dir.strip("/")
 
-        code, msg = _run_cmd("svn status", path)
+        code, msg = _run_cmd(["svn", "status"], path)
         dirty = bool(msg)
 
-        code, msg = _run_cmd("svn info --show-item repos-root-url", path)
+        code, msg = _run_cmd(["svn", "info", "--show-item", "repos-root-url"], path)
         url = msg.strip("/")
 
-        code, msg = _run_cmd("svn info --show-item revision", path)
+        code, msg = _run_cmd(["svn", "info", "--show-item", "revision"], path)
         if not msg or msg == "0":
             commit = None
         else:
@@ -1539,14 +1781,17 @@ class Version:
 
         timestamp = None
         if commit:
-            code, msg = _run_cmd("svn info --show-item last-changed-date", path)
+            code, msg = _run_cmd(["svn", "info", "--show-item", "last-changed-date"], path)
             timestamp = _parse_timestamp(msg)
 
         if not commit:
             return cls._fallback(strict, distance=0, commit=commit, dirty=dirty, timestamp=timestamp, vcs=vcs)
-        code, msg = _run_cmd('svn ls -v -r {} "{}/{}"'.format(commit, url, tag_dir), path)
-        lines = [line.split(maxsplit=5) for line in msg.splitlines()[1:]]
-        tags_to_revs = {line[-1].strip("/"): int(line[0]) for line in lines}
+        code, msg = _run_cmd(["svn", "ls", "-v", "-r", commit, "{}/{}".format(url, tag_dir)], path)
+        tags_to_revs = {}
+        for line in msg.splitlines()[1:]:
+            parts = line.split(maxsplit=5)
+            if parts:
+                tags_to_revs[parts[-1].strip("/")] = int(parts[0])
         if not tags_to_revs:
             try:
                 distance = int(commit)
@@ -1555,9 +1800,13 @@ class Version:
             return cls._fallback(strict, distance=distance, commit=commit, dirty=dirty, timestamp=timestamp, vcs=vcs)
         tags_to_sources_revs = {}
         for tag, rev in tags_to_revs.items():
-            code, msg = _run_cmd('svn log -v "{}/{}/{}" --stop-on-copy'.format(url, tag_dir, tag), path)
+            code, msg = _run_cmd(["svn", "log", "-v", "{}/{}/{}".format(url, tag_dir, tag), "--stop-on-copy"], path)
+            prefix = "A /{}/{} (from ".format(tag_dir, tag)
+            copy_line = re.compile(re.escape(prefix) + r".+?:(\d+)\)")
             for line in msg.splitlines():
-                match = re.search(r"A /{}/{} \(from .+?:(\d+)\)".format(tag_dir, tag), line)
+                if prefix not in line:
+                    continue
+                match = copy_line.search(line)
                 if match:
                     source = int(match.group(1))
                     tags_to_sources_revs[tag] = (source, rev)
@@ -1623,10 +1872,10 @@ class Version:
         vcs = Vcs.Bazaar
         _detect_vcs(vcs, path)
 
-        code, msg = _run_cmd("bzr status", path)
+        code, msg = _run_cmd(["bzr", "status"], path)
         dirty = msg != ""
 
-        code, msg = _run_cmd("bzr log --limit 1", path)
+        code, msg = _run_cmd(["bzr", "log", "--limit", "1"], path)
         commit = None
         branch = None
         timestamp = None
@@ -1643,7 +1892,7 @@ class Version:
             if len(info) == 2:
                 timestamp = dt.datetime.strptime(info[1], "%a %Y-%m-%d %H:%M:%S %z")
 
-        code, msg = _run_cmd("bzr tags", path)
+        code, msg = _run_cmd(["bzr", "tags"], path)
         if not msg or not commit:
             try:
                 distance = int(commit) if commit is not None else 0
@@ -1658,8 +1907,12 @@ class Version:
                 timestamp=timestamp,
                 vcs=vcs,
             )
-        tags_to_revs = {line.split()[0]: int(line.split()[1]) for line in msg.splitlines() if line.split()[1] != "?"}
-        tags = [x[1] for x in sorted([(v, k) for k, v in tags_to_revs.items()], reverse=True)]
+        tags_to_revs = {}
+        for line in msg.splitlines():
+            tag, rev = line.split()[:2]
+            if rev != "?":
+                tags_to_revs[tag] = int(rev)
+        tags = [k for k, v in sorted(tags_to_revs.items(), key=lambda kv: (kv[1], kv[0]), reverse=True)]
 
         matched_pattern = _match_version_pattern(pattern, tags, latest_tag, strict, pattern_prefix)
         if matched_pattern is None:
@@ -1720,26 +1973,29 @@ class Version:
         vcs = Vcs.Fossil
         _detect_vcs(vcs, path)
 
-        code, msg = _run_cmd("fossil changes --differ", path)
+        code, msg = _run_cmd(["fossil", "changes", "--differ"], path)
         dirty = bool(msg)
 
-        code, msg = _run_cmd("fossil branch current", path)
+        code, msg = _run_cmd(["fossil", "branch", "current"], path)
         branch = msg
 
-        code, msg = _run_cmd("fossil sql \"SELECT value FROM vvar WHERE name = 'checkout-hash' LIMIT 1\"", path)
-        commit = msg.strip("'")[:commit_length]
-
+        # One invocation for the three scalar lookups; each statement emits one line.
         code, msg = _run_cmd(
-            'fossil sql "'
-            "SELECT DATETIME(mtime) FROM event JOIN blob ON event.objid=blob.rid WHERE type = 'ci'"
-            " AND uuid = (SELECT value FROM vvar WHERE name = 'checkout-hash' LIMIT 1) LIMIT 1\"",
+            [
+                "fossil",
+                "sql",
+                "SELECT value FROM vvar WHERE name = 'checkout-hash' LIMIT 1;"
+                " SELECT DATETIME(mtime) FROM event JOIN blob ON event.objid=blob.rid WHERE type = 'ci'"
+                " AND uuid = (SELECT value FROM vvar WHERE name = 'checkout-hash' LIMIT 1) LIMIT 1;"
+                " SELECT count() FROM event WHERE type = 'ci'",
+            ],
             path,
         )
-        timestamp = dt.datetime.strptime(msg.strip("'") + "+0000", "%Y-%m-%d %H:%M:%S%z")
-
-        code, msg = _run_cmd("fossil sql \"SELECT count() FROM event WHERE type = 'ci'\"", path)
+        scalars = msg.splitlines()
+        commit = scalars[0].strip("'")[:commit_length]
+        timestamp = dt.datetime.strptime(scalars[1].strip("'") + "+0000", "%Y-%m-%d %H:%M:%S%z")
         # The repository creation itself counts as a commit.
-        total_commits = int(msg) - 1
+        total_commits = int(scalars[2]) - 1
         if total_commits <= 0:
             return cls._fallback(
                 strict,
@@ -1776,7 +2032,7 @@ class Version:
                 WHERE tagxref.tagtype = 1
                 ORDER BY event.mtime DESC, tagxref.mtime DESC;
         """
-        code, msg = _run_cmd('fossil sql "{}"'.format(" ".join(query.splitlines())), path)
+        code, msg = _run_cmd(["fossil", "sql", " ".join(query.splitlines())], path)
         if not msg:
             try:
                 distance = int(total_commits)
@@ -1792,9 +2048,10 @@ class Version:
                 vcs=vcs,
             )
 
-        tags_to_distance = [
-            (line.rsplit(",", 1)[0][5:-1], int(line.rsplit(",", 1)[1]) - 1) for line in msg.splitlines()
-        ]
+        tags_to_distance = []
+        for line in msg.splitlines():
+            tag_name, _, generation = line.rpartition(",")
+            tags_to_distance.append((tag_name[5:-1], int(generation) - 1))
 
         matched_pattern = _match_version_pattern(
             pattern, [t for t, d in tags_to_distance], latest_tag, strict, pattern_prefix
@@ -1858,17 +2115,17 @@ class Version:
         vcs = Vcs.Pijul
         _detect_vcs(vcs, path)
 
-        code, msg = _run_cmd("pijul diff --short", path)
+        code, msg = _run_cmd(["pijul", "diff", "--short"], path)
         dirty = msg.strip() != ""
 
-        code, msg = _run_cmd("pijul channel", path)
+        code, msg = _run_cmd(["pijul", "channel"], path)
         branch = "main"
         for line in msg.splitlines():
             if line.startswith("* "):
                 branch = line.split("* ", 1)[1]
                 break
 
-        code, msg = _run_cmd("pijul log --limit 1 --output-format json", path)
+        code, msg = _run_cmd(["pijul", "log", "--limit", "1", "--output-format", "json"], path)
         limited_commits = json.loads(msg)
         if len(limited_commits) == 0:
             return cls._fallback(strict, dirty=dirty, branch=branch, vcs=vcs)
@@ -1876,10 +2133,10 @@ class Version:
         commit = limited_commits[0]["hash"][:commit_length]
         timestamp = _parse_timestamp(limited_commits[0]["timestamp"])
 
-        code, msg = _run_cmd("pijul log --output-format json", path)
+        code, msg = _run_cmd(["pijul", "log", "--output-format", "json"], path)
         channel_commits = json.loads(msg)
 
-        code, msg = _run_cmd("pijul tag", path)
+        code, msg = _run_cmd(["pijul", "tag"], path)
         if not msg:
             # The channel creation is in the list, so offset by 1.
             distance = len(channel_commits) - 1
@@ -1952,8 +2209,8 @@ class Version:
         tag, base, stage, unmatched, tagged_metadata, epoch = matched_pattern
 
         tag_id = tag_meta_by_msg[tag]["state"]
-        _run_cmd("pijul tag checkout {}".format(tag_id), path, codes=[0, 1])
-        code, msg = _run_cmd("pijul log --output-format json --channel {}".format(tag_id), path)
+        _run_cmd(["pijul", "tag", "checkout", tag_id], path, codes=[0, 1])
+        code, msg = _run_cmd(["pijul", "log", "--output-format", "json", "--channel", tag_id], path)
         if msg.strip() == "":
             tag_commits = []  # type: list
         else:
@@ -2145,26 +2402,31 @@ class Version:
         return callback(**kwargs)
 
 
+@lru_cache(maxsize=1024)
 def check_version(version: str, style: Style = Style.Pep440) -> None:
     """
     Check if a version is valid for a style.
 
+    Successful checks are memoized, so revalidating the same version
+    (e.g., when a tool serializes the same Version repeatedly) is free.
+
     :param version: Version to check.
     :param style: Style against which to check.
     :raises ValueError: If the version is invalid.
     """
-    name, pattern = {
-        Style.Pep440: ("PEP 440", _VALID_PEP440),
-        Style.SemVer: ("Semantic Versioning", _VALID_SEMVER),
-        Style.Pvp: ("PVP", _VALID_PVP),
+    name, validator = {
+        Style.Pep440: ("PEP 440", _check_version_pep440),
+        Style.SemVer: ("Semantic Versioning", _VALID_SEMVER_RE.fullmatch),
+        Style.Pvp: ("PVP", _check_version_pvp),
     }[style]
     failure_message = "Version '{}' does not conform to the {} style".format(version, name)
-    if not re.search(pattern, version):
+    if not validator(version):
         raise ValueError(failure_message)
     if style == Style.SemVer:
-        parts = re.split(r"[.-]", version.split("+", 1)[0])
-        if any(re.search(r"^0[0-9]+$", x) for x in parts):
-            raise ValueError(failure_message)
+        for chunk in version.split("+", 1)[0].split("."):
+            for part in chunk.split("-"):
+                if len(part) > 1 and part[0] == "0" and part.isdigit():
+                    raise ValueError(failure_message)
 
 
 def get_version(
@@ -2222,6 +2484,14 @@ def get_version(
     return fallback
 
 
+def _join_identifiers(identifiers: Sequence[Union[str, int]], separator: str) -> str:
+    if len(identifiers) == 1:
+        # Skip the join machinery for the common single-identifier case.
+        first = identifiers[0]
+        return first if isinstance(first, str) else str(first)
+    return separator.join([x if isinstance(x, str) else str(x) for x in identifiers])
+
+
 def serialize_pep440(
     base: str,
     stage: Optional[str] = None,
@@ -2246,32 +2516,30 @@ def serialize_pep440(
     :param metadata: Any local version label segments.
     :returns: Serialized version.
     """
-    out = []  # type: list
+    if epoch is None and stage is None and post is None and dev is None and not metadata:
+        # Common shape: just a release segment.
+        check_version(base, Style.Pep440)
+        return base
 
-    if epoch is not None:
-        out.extend([epoch, "!"])
-
-    out.append(base)
+    serialized = base if epoch is None else "{}!{}".format(epoch, base)
 
     if stage is not None:
         alternative_stages = {"alpha": "a", "beta": "b", "c": "rc", "pre": "rc", "preview": "rc"}
-        out.append(alternative_stages.get(stage.lower(), stage.lower()))
-        if revision is None:
-            # PEP 440 does not allow omitting the revision, so assume 0.
-            out.append(0)
-        else:
-            out.append(revision)
+        # PEP 440 does not allow omitting the revision, so assume 0.
+        serialized += "{}{}".format(
+            alternative_stages.get(stage.lower(), stage.lower()),
+            0 if revision is None else revision,
+        )
 
     if post is not None:
-        out.extend([".post", post])
+        serialized += ".post{}".format(post)
 
     if dev is not None:
-        out.extend([".dev", dev])
+        serialized += ".dev{}".format(dev)
 
     if metadata is not None and len(metadata) > 0:
-        out.extend(["+", ".".join(map(str, metadata))])
+        serialized += "+" + _join_identifiers(metadata, ".")
 
-    serialized = "".join(map(str, out))
     check_version(serialized, Style.Pep440)
     return serialized
 
@@ -2291,15 +2559,18 @@ def serialize_semver(
     :param metadata: Build metadata identifiers.
     :returns: Serialized version.
     """
-    out = [base]
+    if not pre and not metadata:
+        check_version(base, Style.SemVer)
+        return base
+
+    serialized = base
 
     if pre is not None and len(pre) > 0:
-        out.extend(["-", ".".join(map(str, pre))])
+        serialized += "-" + _join_identifiers(pre, ".")
 
     if metadata is not None and len(metadata) > 0:
-        out.extend(["+", ".".join(map(str, metadata))])
+        serialized += "+" + _join_identifiers(metadata, ".")
 
-    serialized = "".join(str(x) for x in out)
     check_version(serialized, Style.SemVer)
     return serialized
 
@@ -2314,12 +2585,15 @@ def serialize_pvp(base: str, metadata: Optional[Sequence[Union[str, int]]] = Non
     :param metadata: Version tag metadata.
     :returns: Serialized version.
     """
-    out = [base]
+    if not metadata:
+        check_version(base, Style.Pvp)
+        return base
+
+    serialized = base
 
     if metadata is not None and len(metadata) > 0:
-        out.extend(["-", "-".join(map(str, metadata))])
+        serialized += "-" + _join_identifiers(metadata, "-")
 
-    serialized = "".join(map(str, out))
     check_version(serialized, Style.Pvp)
     return serialized
 
@@ -2337,37 +2611,55 @@ def bump_version(base: str, index: int = -1, increment: int = 1) -> str:
     :param increment: By how much the `index` needs to increment.
     :returns: Bumped version.
     """
-    bases = [int(x) for x in base.split(".")]
-    bases[index] += increment
+    parts = base.split(".")
+    parts[index] = str(int(parts[index]) + increment)
 
-    limit = 0 if index < 0 else len(bases)
+    limit = 0 if index < 0 else len(parts)
     i = index + 1
     while i < limit:
-        bases[i] = 0
+        parts[i] = "0"
         i += 1
 
-    return ".".join(str(x) for x in bases)
+    return ".".join(parts)
 
 
 def _parse_git_timestamp_iso_strict(raw: str) -> dt.datetime:
+    if sys.version_info >= (3, 7):
+        try:
+            # C-implemented fast path; handles Git's strict ISO output directly.
+            return dt.datetime.fromisoformat(raw)
+        except ValueError:
+            pass
+
     # Remove colon from timezone offset for pre-3.7 Python:
-    compat = re.sub(r"(.*T.*[-+]\d+):(\d+)", r"\1\2", raw)
+    compat = _TIMESTAMP_TZ_COLON_STRICT_RE.sub(r"\1\2", raw)
     return _parse_timestamp(compat, _TIMESTAMP_GIT_ISO_STRICT)
 
 
 def _parse_git_timestamp_iso(raw: str) -> dt.datetime:
     # Remove colon from timezone offset for pre-3.7 Python:
-    compat = re.sub(r"(.* .* [-+]\d+):(\d+)", r"\1\2", raw)
+    compat = _TIMESTAMP_TZ_COLON_RE.sub(r"\1\2", raw)
     return _parse_timestamp(compat, _TIMESTAMP_GIT_ISO)
 
 
 def _parse_timestamp(raw: str, format: str = _TIMESTAMP_GENERIC) -> dt.datetime:
     # Normalize "Z" for pre-3.7 compatibility:
-    normalized = re.sub(r"Z$", "+0000", raw)
+    normalized = _TIMESTAMP_ZULU_RE.sub("+0000", raw)
     # Truncate %f to six digits:
-    normalized = re.sub(r"\.(\d{6})\d+\+0000", r".\g<1>+0000", normalized)
+    normalized = _TIMESTAMP_SUBSECOND_RE.sub(r".\g<1>+0000", normalized)
 
     return dt.datetime.strptime(normalized, format)
 
 
-__version__ = get_version("dunamai").serialize()
+if sys.version_info >= (3, 7):
+    # Compute __version__ lazily (PEP 562), so that merely importing Dunamai
+    # does not pay for a metadata lookup.
+    def __getattr__(name: str) -> str:
+        if name == "__version__":
+            version = get_version("dunamai").serialize()
+            globals()["__version__"] = version
+            return version
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+else:
+    __version__ = get_version("dunamai").serialize()
@@ -222,8 +222,16 @@ def test__version__from_git__with_annotated_tags(tmp_path) -> None:
             run("git tag v0.3.0+a,b -m Annotated")
             assert from_vcs() == Version("0.3.0", dirty=False, tagged_metadata="a,b", branch=b)
 
+        if not legacy:
+            # Additional one-off check: tag containing parentheses.
+            (vcs / "foo.txt").write_text("fifth")
+            run("git add .")
+            run('git commit --no-gpg-sign -m "Fifth"')
+            run("git tag v0.4.0+c(d) -m Annotated")
+            assert from_vcs() == Version("0.4.0", dirty=False, tagged_metadata="c(d)", branch=b)
+
     if not legacy:
-        assert from_vcs(path=vcs) == Version("0.3.0", dirty=False, tagged_metadata="a,b", branch=b)
+        assert from_vcs(path=vcs) == Version("0.4.0", dirty=False, tagged_metadata="c(d)", branch=b)
 
 
 @pytest.mark.skipif(shutil.which("git") is None, reason="Requires Git")
@@ -119,7 +119,14 @@ def test__version__repr() -> None:
 def test__version__ordering() -> None:
     assert Version("0.1.0", distance=2) == Version("0.1.0", distance=2)
     assert Version("0.2.0") > Version("0.1.0")
+    assert Version("0.1.0") < Version("0.2.0")
     assert Version("0.1.0", distance=2) > Version("0.1.0", distance=1)
+    assert Version("0.1.0", distance=1) < Version("0.1.0", distance=2)
+    assert sorted([Version("0.2.0"), Version("0.1.0"), Version("0.1.1")]) == [
+        Version("0.1.0"),
+        Version("0.1.1"),
+        Version("0.2.0"),
+    ]
     with pytest.raises(TypeError):
         Version("0.1.0") == "0.1.0"
     with pytest.raises(TypeError):
@@ -131,6 +138,11 @@ def test__version__ordering() -> None:
     assert Version("0.1.0") != Version("0.1.0", dirty=False)
 
 
+def test__version__hash() -> None:
+    assert hash(Version("0.1.0", distance=2)) == hash(Version("0.1.0", distance=2))
+    assert len({Version("0.1.0"), Version("0.1.0"), Version("0.2.0")}) == 2
+
+
 def test__version__serialize__pep440() -> None:
     assert Version("0.1.0").serialize() == "0.1.0"
 